@@ -0,0 +1,145 @@
+import json
+import random
+
+from tradingview import TradingViewWs
+
+
+def generate_ohlcv(bars: int, interval: int = 60, price: float = 2000.0, price_scale: int = 1000,
+                   start: int = 1_700_006_400, seed: int = 0) -> list[list[float]]:
+    rng = random.Random(seed)
+    candles = []
+    
+    for i in range(bars):
+        open_price = price
+        close_price = max(open_price + rng.gauss(0, open_price * 0.002), 1 / price_scale)
+        high_price = max(open_price, close_price) + abs(rng.gauss(0, open_price * 0.001))
+        low_price = max(min(open_price, close_price) - abs(rng.gauss(0, open_price * 0.001)), 1 / price_scale)
+        volume = float(rng.randint(100, 10_000))
+        
+        candles.append([float(start + i * interval * 60)] + [round(x * price_scale) / price_scale for x in (open_price, high_price, low_price, close_price)] + [volume])
+        price = close_price
+        
+    return candles
+
+
+def frame(*payloads: dict) -> str:
+    return ''.join('~m~' + str(len(text)) + '~m~' + text for text in (json.dumps(p, separators=(',', ':')) for p in payloads))
+
+
+def symbol_resolved_message(symbol_id: str, price_scale: int, chart_session: str = 'cs_benchmark') -> str:
+    exchange, name = symbol_id.split(':')
+    return frame({'m': 'symbol_resolved', 'p': [chart_session, 'symbol_1', {
+        'name': name, 'exchange': exchange, 'pro_name': symbol_id, 'type': 'commodity',
+        'session': '24x7', 'timezone': 'Etc/UTC', 'minmov': 1, 'pricescale': price_scale,
+        'has_intraday': True, 'visible_plots_set': 'ohlcv'
+    }]})
+
+
+def series_message(method: str, candles: list[list[float]], first_index: int = 0, chart_session: str = 'cs_benchmark') -> str:
+    series = {'node': 'bench', 's': [{'i': first_index + i, 'v': candle} for i, candle in enumerate(candles)],
+              'ns': {'d': '', 'indexes': []}, 't': 's1', 'lbs': {'bar_close_time': int(candles[-1][0])}}
+    return frame({'m': method, 'p': [chart_session, {'s1': series}]})
+
+
+def timescale_update_message(candles: list[list[float]], chart_session: str = 'cs_benchmark') -> str:
+    return series_message('timescale_update', candles, chart_session=chart_session)
+
+
+def du_message(candle: list[float], index: int, chart_session: str = 'cs_benchmark') -> str:
+    return series_message('du', [candle], index, chart_session)
+
+
+def tick(candle: list[float], seed: int) -> list[float]:
+    rng = random.Random(seed)
+    time, open_price, high_price, low_price, close_price, volume = candle
+    close_price = round(close_price * (1 + rng.gauss(0, 0.0005)), 3)
+    return [time, open_price, max(high_price, close_price), min(low_price, close_price), close_price, volume + rng.randint(1, 50)]
+
+
+def create_session(bars: int, symbol_id: str = 'OANDA:XAUUSD', interval: str = '60', price_scale: int = 1000, seed: int = 0,
+                   compact: bool = False) -> tuple[TradingViewWs, list[list[float]]]:
+    session = TradingViewWs(symbol_id, interval, compact=compact)
+    candles = generate_ohlcv(bars, int(interval), price_scale=price_scale, seed=seed)
+    
+    session.update_candles(symbol_resolved_message(symbol_id, price_scale), bars)
+    session.update_candles(timescale_update_message(candles), bars)
+    
+    return session, candles
+
+
+def generate_stream(bars: int = 500, ticks: int = 200, symbol_id: str = 'OANDA:XAUUSD', interval: str = '60',
+                    price_scale: int = 1000, seed: int = 0, chart_session: str = 'cs_benchmark') -> list[str]:
+    # Synthetic, not captured: mirrors the shape of a chart session, several payloads per message included
+    candles = generate_ohlcv(bars + ticks // 20 + 1, int(interval), price_scale=price_scale, seed=seed)
+    history, upcoming = candles[:bars], candles[bars:]
+    quote = {'m': 'qsd', 'p': ['qs_benchmark', {'n': symbol_id, 's': 'ok', 'v': {'lp': history[-1][4], 'volume': 1000}}]}
+    
+    messages = [
+        symbol_resolved_message(symbol_id, price_scale, chart_session) + frame({'m': 'series_loading', 'p': [chart_session, 's1', 's1_benchmark']}),
+        timescale_update_message(history, chart_session) + frame({'m': 'series_completed', 'p': [chart_session, 's1', 'streaming', 's1_benchmark']})
+    ]
+    
+    candle = history[-1]
+    index = bars - 1
+    
+    for i in range(ticks):
+        if i and i % 20 == 0:
+            index += 1
+            candle = upcoming.pop(0)
+        else:
+            candle = tick(candle, seed * ticks + i)
+            
+        message = du_message(candle, index, chart_session)
+        if i % 3 == 0:
+            quote['p'][1]['v']['lp'] = candle[4]
+            message = frame(quote) + message
+        if i % 10 == 9:
+            message += '~m~4~m~~h~' + str(i // 10)
+            
+        messages.append(message)
+        
+    return messages
+
+
+def generate_updates(total_candle: int, seed: int = 0, price_scale: int = 1000, overflow: bool = False,
+                     backfill: bool = False) -> list[str]:
+    # Live bar ticks, new bars, bulk history and re-sent bars still held, in the proportions of a busy chart session
+    rng = random.Random(seed)
+    candles = generate_ohlcv(total_candle * 3 + 200, price_scale=price_scale, seed=seed)
+    position = rng.randint(1, total_candle)
+    messages = [symbol_resolved_message('OANDA:XAUUSD', price_scale), timescale_update_message(candles[:position])]
+    
+    while position < len(candles):
+        choice = rng.random()
+        
+        if choice < 0.5:
+            candle = candles[position - 1][:]
+            candle[4] = round(candle[4] + 1 / price_scale, 3)
+            batch = [candle]
+        elif choice < 0.9:
+            batch = candles[position:position + 1]
+            position += 1
+        elif choice < 0.95:
+            size = rng.randint(1, total_candle + 100)
+            batch = candles[position:position + size]
+            position += size
+        else:
+            batch = [candles[rng.randint(max(0, position - total_candle), position - 1)]]
+            
+        if batch:
+            messages.append(series_message('du', batch, position - len(batch)))
+            
+    if backfill:
+        # A bar older than the last one that the session has not seen
+        candle = candles[-1][:]
+        candle[0] -= 30 * 60
+        messages.append(du_message(candle, position))
+        
+    if overflow:
+        # Prices past the int32 tick range of the compact storage
+        candle = candles[-1][:]
+        candle[0] += 60 * 60
+        candle[1:5] = [x * 10_000 for x in candle[1:5]]
+        messages.append(du_message(candle, position + 1))
+        
+    return messages
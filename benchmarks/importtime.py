@@ -0,0 +1,76 @@
+import argparse
+import os
+import subprocess
+import sys
+
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['utils', 'tradingview', 'threads', 'windows']
+LAZY_MODULES = ['pandas', 'numpy', 'talib', 'discord_webhook', 'websocket']
+BUDGET_MS = 300
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             cwd=ROOT_PATH, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    
+    # Children are printed before their parent, so a top level module owns every line since the previous top level one.
+    # Only the measured module's block counts, interpreter startup (site, encodings, .pth files) is not our import time
+    block = set()
+    
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        
+        block.add(name.strip().split('.')[0])
+        
+        if name.startswith('  '):
+            continue
+        
+        if name.strip() == module:
+            return int(cumulative) / 1000, block
+        
+        block = set()
+        
+    raise RuntimeError(f'{module} does not appear in the import time report')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check the cold import time of the application modules')
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    parser.add_argument('--budget', type=float, default=BUDGET_MS, help='budget per module in milliseconds')
+    args = parser.parse_args()
+    
+    failed = False
+    
+    for module in args.modules:
+        try:
+            elapsed, imported = measure(module)
+        except RuntimeError as e:
+            print(f'{module:<12} error: {e}')
+            failed = True
+            continue
+        
+        eager = sorted(imported.intersection(LAZY_MODULES))
+        status = 'ok'
+        
+        if eager:
+            status = f'imports {", ".join(eager)} eagerly'
+            failed = True
+        elif elapsed > args.budget:
+            status = f'over budget of {args.budget:.0f} ms'
+            failed = True
+            
+        print(f'{module:<12} {elapsed:8.1f} ms  {status}')
+        
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,33 @@
+import argparse
+import gc
+import sys
+
+import utils
+
+from .generators import create_session
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Report RSS per series for a synthetic watchlist')
+    parser.add_argument('--series', type=int, default=1000)
+    parser.add_argument('--bars', type=int, default=500)
+    parser.add_argument('--compact', action='store_true', help='store candles as int32 price ticks, float32 volumes and int32 bar times')
+    parser.add_argument('--limit', type=int, default=10, help='number of series to list')
+    args = parser.parse_args()
+    
+    sessions = {}
+    
+    for seed in range(args.series):
+        session, _ = create_session(args.bars, seed=seed, compact=args.compact)
+        sessions.update({f'{session.symbol_id}_{seed}': session})
+        
+    gc.collect()
+    
+    usages = {identify: session.memory_usage() for identify, session in sessions.items()}
+    print(utils.format_memory_report(utils.get_rss(), usages, args.limit))
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,392 @@
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .generators import create_session, du_message, generate_stream, generate_updates, tick
+
+
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+BASELINES_PATH = os.path.join(BENCHMARKS_PATH, 'baselines.json')
+BARS = [500, 5_000, 50_000]
+SERIES = [1, 50, 500]
+SERIES_BARS = 500
+TOLERANCE = 0.25
+# Timing changes smaller than this are scheduler noise whatever their percentage
+NOISE_FLOOR = 0.0002
+CALIBRATION_TIME = 0.02
+RETRIES = 2
+# Microsecond cases are dominated by thread wake-ups, they are reported but never fail the run
+UNGATED = ['alert/put', 'alert/unix_latency']
+
+
+@dataclass
+class Result:
+    value: float
+    unit: str
+    # Timings in units of the calibration workload, which is what baselines are compared in
+    ratio: Optional[float] = field(default=None)
+    measure: Optional[Callable[[], tuple[float, float]]] = field(default=None)
+
+
+def calibration_workload():
+    values = [float(i) for i in range(20_000)]
+    total = 0.0
+    
+    for value in values:
+        total = max(total, value * 1.0001) if value % 3 else min(total, value)
+        
+    np.sort(np.asarray(values)[::-1])
+
+
+def run_round(func: Callable[[], object], duration: float) -> float:
+    timings = []
+    started = time.perf_counter()
+    
+    while not timings or time.perf_counter() - started < duration:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        
+    return statistics.median(timings)
+
+
+def time_it(func: Callable[[], object], min_time: float = 0.2, rounds: int = 5) -> tuple[float, float]:
+    # Each round is bracketed by calibration runs, so the ratio cancels the slow phases of a shared machine
+    timings = []
+    ratios = []
+    
+    for _ in range(rounds):
+        before = run_round(calibration_workload, CALIBRATION_TIME)
+        timing = run_round(func, min_time / rounds)
+        after = run_round(calibration_workload, CALIBRATION_TIME)
+        
+        timings.append(timing)
+        ratios.append(timing / min(before, after))
+        
+    return min(timings), statistics.median(ratios)
+
+
+def timed(func: Callable[[], object], **kwargs) -> Result:
+    measure = lambda: time_it(func, **kwargs)
+    value, ratio = measure()
+    
+    return Result(value, 's', ratio, measure)
+
+
+def allocated(func: Callable[[], object]) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        
+    return current, result
+
+
+def peak_allocated(func: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        
+    return peak
+
+
+def evaluate_plans(session, df):
+    from threads.plan import PDZonePlan, RejectionPlan
+    
+    results = [PDZonePlan(session, df).get_result()]
+    if session.interval not in ['15', '30']:
+        results.append(RejectionPlan(session, df).get_result())
+        
+    return results
+
+
+class Ticker:
+    def __init__(self, bars: int, seed: int = 0, compact: bool = False):
+        self.session, candles = create_session(bars, seed=seed, compact=compact)
+        self.total_candle = bars
+        self.candle = candles[-1]
+        self.index = bars - 1
+        self.count = 0
+        
+    def tick(self):
+        self.count += 1
+        self.candle = tick(self.candle, self.count)
+        self.session.update_candles(du_message(self.candle, self.index), self.total_candle)
+        return self.session.get_dataframe()
+    
+    def close_bar(self):
+        self.index += 1
+        close = self.candle[4]
+        self.candle = [self.candle[0] + int(self.session.interval) * 60, close, close, close, close, 1.0]
+        return self.tick()
+    
+    
+def replay_stream():
+    from tradingview import TradingViewWs
+    
+    messages = generate_stream()
+    
+    def run():
+        session = TradingViewWs('OANDA:XAUUSD', '60')
+        for message in messages:
+            if session.update_candles(message, 500):
+                session.get_dataframe()
+                
+    return run, len(messages)
+
+
+def check_storage(seeds: int = 20) -> list[str]:
+    import pandas as pd
+    
+    from tradingview import TradingViewWs
+    
+    failed = []
+    
+    for seed in range(seeds):
+        total_candle = [5, 20, 100, 500][seed % 4]
+        overflow = seed % 5 == 4
+        backfill = seed % 5 == 3
+        name = f'storage/{seed}' + ('/overflow' if overflow else '') + ('/backfill' if backfill else '')
+        
+        session = TradingViewWs('OANDA:XAUUSD', '60')
+        compact_session = TradingViewWs('OANDA:XAUUSD', '60', compact=True)
+        messages = generate_updates(total_candle, seed, overflow=overflow, backfill=backfill)
+        
+        try:
+            for i, message in enumerate(messages):
+                updated = session.update_candles(message, total_candle)
+                assert compact_session.update_candles(message, total_candle) == updated
+                
+                # Frames are only built for messages that carried bars, like realtime_bar_chart does
+                if not updated:
+                    continue
+                
+                df, compact_df = session.get_dataframe(), compact_session.get_dataframe()
+                
+                # An unseen bar older than the last one is appended by the OrderedDict but kept in time order by the compact storage
+                if backfill and i == len(messages) - 1:
+                    assert compact_df['time'].is_monotonic_increasing
+                    df = df.sort_values('time', ignore_index=True)
+                    
+                pd.testing.assert_frame_equal(df, compact_df, check_exact=True)
+                
+            assert compact_session.compact != overflow
+        except AssertionError:
+            failed.append(name)
+            
+    return failed
+
+
+def collect_alerts() -> dict[str, Result]:
+    import socket
+    import tempfile
+    
+    from threads.sinks import Alert, JsonLinesSink, SinkWorker, StreamSink
+    
+    results = {}
+    alert = Alert('OANDA:XAUUSD', '1h', 'PDZonePlan', 1, 'Price returns to DISCOUNT zone', '2024-01-01 00:00:00')
+    
+    with tempfile.TemporaryDirectory() as directory:
+        worker = SinkWorker(JsonLinesSink(os.path.join(directory, 'alerts.jsonl')), maxsize=0)
+        worker.start()
+        
+        value, ratio = time_it(lambda: worker.put(alert))
+        results['alert/put'] = Result(value, 's', ratio)
+        
+        worker.close()
+        worker.wait()
+        
+        if not hasattr(socket, 'AF_UNIX'):
+            return results
+        
+        address = os.path.join(directory, 'alerts.sock')
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(address)
+        server.listen()
+        
+        worker = SinkWorker(StreamSink(address))
+        worker.start()
+        worker.put(alert)
+        
+        connection, _ = server.accept()
+        reader = connection.makefile('rb')
+        reader.readline()
+        
+        def deliver():
+            worker.put(alert)
+            reader.readline()
+            
+        value, ratio = time_it(deliver)
+        results['alert/unix_latency'] = Result(value, 's', ratio)
+        
+        worker.close()
+        worker.wait()
+        reader.close()
+        connection.close()
+        server.close()
+        
+    return results
+
+
+def collect_bars(n: int) -> dict[str, Result]:
+    from threads.plan import supertrend, PDZonePlan, RejectionPlan
+    
+    results = {}
+    ticker = Ticker(n)
+    compact_ticker = Ticker(n, compact=True)
+    df = ticker.tick()
+    
+    results[f'tick/{n}'] = timed(ticker.tick)
+    results[f'tick_compact/{n}'] = timed(compact_ticker.tick)
+    results[f'supertrend/{n}'] = timed(lambda: supertrend(df['high'], df['low'], df['close']))
+    results[f'pdzone/{n}'] = timed(lambda: PDZonePlan(ticker.session, df).get_result())
+    results[f'rejection/{n}'] = timed(lambda: RejectionPlan(ticker.session, df).get_result())
+    results[f'bar_close/{n}'] = timed(lambda: evaluate_plans(ticker.session, ticker.close_bar()))
+    
+    results[f'memory/candles/{n}'] = Result(allocated(lambda: Ticker(n))[0], 'B')
+    results[f'memory/candles_compact/{n}'] = Result(allocated(lambda: Ticker(n, compact=True))[0], 'B')
+    results[f'memory/bar_close/{n}'] = Result(peak_allocated(lambda: evaluate_plans(ticker.session, ticker.close_bar())), 'B')
+    
+    return results
+
+
+def collect_series(n: int) -> dict[str, Result]:
+    results = {}
+    
+    size, tickers = allocated(lambda: [Ticker(SERIES_BARS, seed) for seed in range(n)])
+    results[f'tick_all/{n}'] = timed(lambda: [ticker.tick() for ticker in tickers], rounds=3)
+    results[f'memory/series/{n}'] = Result(size, 'B')
+    
+    size, _ = allocated(lambda: [Ticker(SERIES_BARS, seed, compact=True) for seed in range(n)])
+    results[f'memory/series_compact/{n}'] = Result(size, 'B')
+    
+    return results
+
+
+def collect(bars: list[int], series: list[int]) -> dict[str, Result]:
+    results = {}
+    
+    run, count = replay_stream()
+    measure = lambda: tuple(x / count for x in time_it(run))
+    value, ratio = measure()
+    results['tick/synthetic_stream'] = Result(value, 's', ratio, measure)
+    
+    for n in bars:
+        results.update(collect_bars(n))
+        
+    for n in series:
+        results.update(collect_series(n))
+        
+    return results
+
+
+def format_value(value: float, unit: str) -> str:
+    if unit == 'B':
+        return f'{value / 1024 ** 2:10.2f} MiB'
+    
+    return f'{value * 1000:10.3f} ms '
+
+
+def compare(result: Result, baseline: float) -> float:
+    if not baseline:
+        return 0
+    
+    # Timings are compared in units of the calibration workload, so a slower or busier machine does not read as a regression
+    if result.unit == 's':
+        return result.ratio / baseline - 1
+    
+    return result.value / baseline - 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the parsing, storage, indicator and plan hot paths')
+    parser.add_argument('--bars', type=int, nargs='+', default=BARS)
+    parser.add_argument('--series', type=int, nargs='+', default=SERIES)
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='allowed regression as a fraction of the baseline')
+    parser.add_argument('--save', action='store_true', help=f'store the results as the new baselines in {BASELINES_PATH}')
+    args = parser.parse_args()
+    
+    # Plans warn on every evaluation with some pandas versions, which would drown the report
+    warnings.filterwarnings('ignore', category=RuntimeWarning, module='threads.plan')
+    
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH, encoding='utf-8') as file:
+            baselines = json.load(file)
+            
+    # Compact storage must hold the same bars as the default storage, a faster but different frame is not a speed-up
+    mismatched = check_storage()
+    for name in mismatched:
+        print(f'{name:<30} compact storage differs from the default storage')
+        
+    results = collect(args.bars, args.series)
+    results.update(collect_alerts())
+    regressed = []
+    
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        status = ''
+        
+        if baseline is not None:
+            change = compare(result, baseline)
+            
+            # Re-measure before failing, a single slow pass is usually another process
+            retries = 0
+            while change > args.tolerance and result.measure is not None and retries < RETRIES:
+                value, ratio = result.measure()
+                result.value, result.ratio = min(result.value, value), min(result.ratio, ratio)
+                change = compare(result, baseline)
+                retries += 1
+                
+            status = f'{change:+8.1%}'
+            
+            if name in UNGATED:
+                status += '  (not gated)'
+            elif change > args.tolerance and (result.unit != 's' or result.value - result.value / (1 + change) > NOISE_FLOOR):
+                status += '  REGRESSED'
+                regressed.append(name)
+                
+        print(f'{name:<30} {format_value(result.value, result.unit)} {status}')
+        
+    if mismatched:
+        print(f'\n{len(mismatched)} update sequence(s) give different frames in compact storage')
+        return 1
+    
+    if args.save:
+        # Timings are stored as calibration ratios, absolute seconds only mean something on the machine that measured them
+        baselines.update({name: result.ratio if result.unit == 's' else result.value for name, result in results.items()})
+        
+        with open(BASELINES_PATH, 'w', encoding='utf-8') as file:
+            json.dump(baselines, file, indent=4)
+            
+        return 0
+    
+    if not baselines:
+        print('\nNo baselines yet, record them with --save')
+    elif regressed:
+        print(f'\n{len(regressed)} benchmark(s) regressed beyond {args.tolerance:.0%}: {", ".join(regressed)}')
+        return 1
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+
+CAPACITY_SLACK = 64
+COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+TICK_LIMIT = np.iinfo(np.int32).max
+
+
+class CompactCandles:
+    def __init__(self):
+        self.price_scale = 0
+        self.origin = 0
+        self.start = 0
+        self.size = 0
+        # Bar times as int32 seconds from the first bar, prices as exact int32 ticks of 1 / pricescale
+        self.times = np.empty(0, dtype=np.int32)
+        self.prices = np.empty((0, 4), dtype=np.int32)
+        self.volumes = np.empty(0, dtype=np.float32)
+        
+    def __len__(self) -> int:
+        return self.size
+    
+    @property
+    def end(self) -> int:
+        return self.start + self.size
+    
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.prices.nbytes + self.volumes.nbytes
+    
+    def reserve(self, capacity: int):
+        if len(self.times) >= capacity:
+            return
+        
+        capacity += CAPACITY_SLACK
+        times = np.empty(capacity, dtype=np.int32)
+        prices = np.empty((capacity, 4), dtype=np.int32)
+        volumes = np.empty(capacity, dtype=np.float32)
+        times[:self.size] = self.times[self.start:self.end]
+        prices[:self.size] = self.prices[self.start:self.end]
+        volumes[:self.size] = self.volumes[self.start:self.end]
+        
+        self.times, self.prices, self.volumes, self.start = times, prices, volumes, 0
+        
+    def make_room(self):
+        if self.end < len(self.times):
+            return
+        
+        self.times[:self.size] = self.times[self.start:self.end]
+        self.prices[:self.size] = self.prices[self.start:self.end]
+        self.volumes[:self.size] = self.volumes[self.start:self.end]
+        self.start = 0
+        
+    def set(self, candle: list[float]):
+        ticks = [round(x * self.price_scale) for x in candle[1:5]]
+        if max(ticks) > TICK_LIMIT or min(ticks) < -TICK_LIMIT:
+            raise OverflowError(f'{candle} does not fit in int32 ticks of 1/{self.price_scale}')
+        
+        volume = candle[5] if len(candle) > 5 else 0
+        
+        if not self.size:
+            self.origin = int(candle[0])
+            
+        offset = int(candle[0]) - self.origin
+        
+        position = self.size
+        if self.size and offset <= self.times[self.end - 1]:
+            position = int(np.searchsorted(self.times[self.start:self.end], offset))
+            if self.times[self.start + position] == offset:
+                self.prices[self.start + position] = ticks
+                self.volumes[self.start + position] = volume
+                return
+            
+        self.make_room()
+        
+        index = self.start + position
+        if index < self.end:
+            self.times[index + 1:self.end + 1] = self.times[index:self.end]
+            self.prices[index + 1:self.end + 1] = self.prices[index:self.end]
+            self.volumes[index + 1:self.end + 1] = self.volumes[index:self.end]
+            
+        self.times[index] = offset
+        self.prices[index] = ticks
+        self.volumes[index] = volume
+        self.size += 1
+        
+    def update(self, items: list[dict], total_candle: int, price_scale: int):
+        self.price_scale = price_scale
+        
+        # Trimmed before inserting like the OrderedDict storage, so both keep the same rows
+        if self.size > total_candle:
+            self.start += self.size - total_candle
+            self.size = total_candle
+            
+        self.reserve(total_candle + len(items))
+        
+        for item in items:
+            self.set(item['v'])
+            
+    def to_list(self) -> list[list[float]]:
+        return self.to_dataframe().values.tolist()
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.prices[self.start:self.end] / self.price_scale, columns=COLUMNS[:4])
+        df.insert(0, 'time', self.times[self.start:self.end].astype(np.int64) + self.origin)
+        df['volume'] = self.volumes[self.start:self.end].astype(np.float64)
+        
+        return df
@@ -12,37 +12,47 @@ def supertrend(high: pd.Series, low: pd.Series, close: pd.Series, period: int =
     atr = talib.ATR(high, low, close, timeperiod=period)
     
     hl2 = (high + low) / 2
-    upperband = hl2 + multiplier * atr
-    lowerband = hl2 - multiplier * atr
+    upperband = np.asarray(hl2 + multiplier * atr, dtype=float)
+    lowerband = np.asarray(hl2 - multiplier * atr, dtype=float)
+    close_values = np.asarray(close, dtype=float)
     
-    final_upperband = upperband.copy()
-    final_lowerband = lowerband.copy()
-
-    for i in range(1, len(close)):
-        if close[i-1] <= final_upperband[i-1]:
-            final_upperband[i] = min(upperband[i], final_upperband[i-1])
+    supertrend = np.full(len(close_values), np.nan)
+    direction = np.full(len(close_values), np.nan)
+    
+    if not len(close_values):
+        return pd.Series(supertrend, index=close.index), pd.Series(direction, index=close.index)
+    
+    # Only the previous bar is needed, carrying it in locals avoids per element pandas indexing and band copies
+    previous_close = close_values[0]
+    previous_upperband = upperband[0]
+    previous_lowerband = lowerband[0]
+    previous_direction = np.nan
+    
+    for i in range(1, len(close_values)):
+        if previous_close <= previous_upperband:
+            final_upperband = min(upperband[i], previous_upperband)
         else:
-            final_upperband[i] = upperband[i]
+            final_upperband = upperband[i]
             
-        if close[i-1] >= final_lowerband[i-1]:
-            final_lowerband[i] = max(lowerband[i], final_lowerband[i-1])
+        if previous_close >= previous_lowerband:
+            final_lowerband = max(lowerband[i], previous_lowerband)
         else:
-            final_lowerband[i] = lowerband[i]
+            final_lowerband = lowerband[i]
             
-    supertrend = pd.Series(index=close.index, dtype=float)
-    direction = pd.Series(index=close.index, dtype=int)
-    
-    for i in range(period, len(close)):
-        if close[i] > final_upperband[i-1]:
-            direction[i] = 1
-        elif close[i] < final_lowerband[i-1]:
-            direction[i] = -1
-        else:
-            direction[i] = direction[i-1]
-
-        supertrend[i] = final_lowerband[i] if direction[i] == 1 else final_upperband[i]
+        if i >= period:
+            if close_values[i] > previous_upperband:
+                previous_direction = 1
+            elif close_values[i] < previous_lowerband:
+                previous_direction = -1
+                
+            direction[i] = previous_direction
+            supertrend[i] = final_lowerband if previous_direction == 1 else final_upperband
+            
+        previous_close = close_values[i]
+        previous_upperband = final_upperband
+        previous_lowerband = final_lowerband
 
-    return supertrend, direction
+    return pd.Series(supertrend, index=close.index), pd.Series(direction, index=close.index)
 
 
 @dataclass
@@ -67,22 +77,23 @@ class BasePlan(ABC):
     
 class PDZonePlan(BasePlan):
     def __init__(self, session, df):
-        super().__init__(session, df.copy())
+        super().__init__(session, df)
         
     def get_result(self):
-        self.df['ST'], self.df['ST_Direction'] = supertrend(self.df['high'], self.df['low'], self.df['close'])
-        self.df['ST'] = np.round(self.df['ST'] * self.session.price_scale) / self.session.price_scale
+        # Only the direction decides the zone, keeping it out of the frame avoids copying every column per tick
+        _, direction = supertrend(self.df['high'], self.df['low'], self.df['close'])
         
-        reference_candle = self.df.iloc[-3]
+        reference_direction = direction.iloc[-3]
+        base_direction = direction.iloc[-2]
         base_candle = self.df.iloc[-2]
         
         result = PlanResult(0, base_candle, False)
         
-        if base_candle['ST_Direction'] > -1 and reference_candle['ST_Direction'] < 1:
+        if base_direction > -1 and reference_direction < 1:
             result.zone = -1
             result.result = True
             result.message = 'Price returns to PREMIUM zone'
-        elif base_candle['ST_Direction'] < 1 and reference_candle['ST_Direction'] > -1:
+        elif base_direction < 1 and reference_direction > -1:
             result.zone = 1
             result.result = True
             result.message = 'Price returns to DISCOUNT zone'
@@ -119,23 +130,27 @@ class RejectionPlan(BasePlan):
                 
             period_start = grouped[-2 if not freq == 'W' else -3]
             period_end = grouped[-1 if not freq == 'W' else -2]
-            previous_session_candles = self.df[(self.df['time'] >= period_start) & (self.df['time'] <= period_end)]
+            # Bar times are sorted and unique, so positional slices select the same rows as boolean masks without copying
+            start = self.df['time'].searchsorted(period_start, side='left')
+            end = self.df['time'].searchsorted(period_end, side='right')
+            if end <= start:
+                continue
             
-            current_session_first_candle = previous_session_candles.iloc[-1]
-            current_session_candles = self.df[self.df['time'] >= current_session_first_candle['time']]
+            current_session_first_candle = self.df.iloc[end - 1]
+            current_session_candles = self.df.iloc[end - 1:]
             
-            previous_session_candles = previous_session_candles.head(len(previous_session_candles) - 1)
-            previous_session_high_candle = previous_session_candles.nlargest(1, 'high').iloc[-1]
-            previous_session_low_candle = previous_session_candles.nsmallest(1, 'low').iloc[-1]
+            previous_session_candles = self.df.iloc[start:end - 1]
+            previous_session_high = previous_session_candles['high'].max()
+            previous_session_low = previous_session_candles['low'].min()
             
             result.base_candle = current_session_first_candle
             
-            if not current_session_candles[current_session_candles['low'] < previous_session_low_candle['low']].empty \
+            if (current_session_candles['low'] < previous_session_low).any() \
                     and current_candle['close'] > current_session_first_candle['open']:
                 result.zone = 1
                 result.result = True
                 result.message = f'Price rejects THE PREVIOUS {freq_mapping[freq]} LOW'
-            elif not current_session_candles[current_session_candles['high'] > previous_session_high_candle['high']].empty \
+            elif (current_session_candles['high'] > previous_session_high).any() \
                     and current_candle['close'] < current_session_first_candle['open']:
                 result.zone = -1
                 result.result = True
@@ -0,0 +1,309 @@
+import json
+import os
+import queue
+import socket
+import sys
+import time
+import traceback
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict, field
+from typing import Optional
+from PyQt5.QtCore import QThread, QMutex, QMutexLocker
+
+
+SINKS_PATH = os.path.join(os.getcwd(), 'sinks.txt')
+WEBHOOKS_PATH = os.path.join(os.getcwd(), 'webhooks.txt')
+QUEUE_SIZE = 1000
+REPORT_INTERVAL = 60
+
+
+def read_lines(file_path: str) -> list[str]:
+    if not os.path.exists(file_path):
+        return []
+    
+    with open(file_path, encoding='utf-8') as file:
+        return [line.strip() for line in file.read().splitlines() if line.strip() and not line.strip().startswith('#')]
+
+
+def get_webhooks() -> list[str]:
+    return read_lines(WEBHOOKS_PATH)
+
+
+@dataclass
+class Alert:
+    symbol_id: str
+    timeframe: str
+    plan: str
+    zone: int
+    message: str
+    time: str
+    created: float = field(default_factory=time.time)
+    
+    @property
+    def content(self) -> str:
+        zone_mapping = {
+            -1: f'- {self.message}',
+            1: f'+ {self.message}'
+        }
+        return f'Symbol: {self.symbol_id}\nTimeframe: {self.timeframe}\n\n{zone_mapping[self.zone]}'
+    
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(',', ':'))
+
+
+class AlertSink(ABC):
+    def open(self):
+        pass
+    
+    def release(self):
+        pass
+    
+    @abstractmethod
+    def deliver(self, alert: Alert):
+        pass
+
+
+# QThread and ABC have conflicting metaclasses, so sinks only deliver and a SinkWorker owns the thread and queue
+class SinkWorker(QThread):
+    def __init__(self, sink: AlertSink, maxsize: int = QUEUE_SIZE):
+        super().__init__()
+        self.sink = sink
+        self.alerts: queue.Queue[Optional[Alert]] = queue.Queue(maxsize)
+        self.mutex = QMutex()
+        self.dropped = 0
+        self.failed = 0
+        self.reported: dict[str, float] = {}
+        self.stop = False
+    
+    def should_report(self, kind: str) -> bool:
+        # A sink that is down fails every alert, one report per interval is enough to notice
+        now = time.monotonic()
+        if now - self.reported.get(kind, -REPORT_INTERVAL) < REPORT_INTERVAL:
+            return False
+        
+        self.reported.update({kind: now})
+        return True
+    
+    def put(self, alert: Alert) -> bool:
+        try:
+            self.alerts.put_nowait(alert)
+        except queue.Full:
+            with QMutexLocker(self.mutex):
+                self.dropped += 1
+                dropped = self.dropped
+                report = self.should_report('dropped')
+                
+            if report:
+                print(type(self.sink).__name__, 'queue is full, dropped', dropped, 'alerts')
+            return False
+        
+        return True
+    
+    def close(self):
+        # Deliver what is already queued, unless the sink is too far behind to take the stop marker
+        try:
+            self.alerts.put_nowait(None)
+        except queue.Full:
+            self.stop = True
+    
+    def run(self):
+        opened = False
+        
+        try:
+            while not self.stop:
+                alert = self.alerts.get()
+                if alert is None:
+                    break
+                
+                try:
+                    # Opened on the first alert and retried on the next one when it fails, a missing directory or reader can come back
+                    if not opened:
+                        self.sink.open()
+                        opened = True
+                    
+                    self.sink.deliver(alert)
+                except Exception:
+                    with QMutexLocker(self.mutex):
+                        self.failed += 1
+                        failed = self.failed
+                        report = self.should_report('failed')
+                        
+                    if report:
+                        traceback.print_exc()
+                        print(type(self.sink).__name__, 'failed to deliver', failed, 'alerts')
+        finally:
+            if opened:
+                self.sink.release()
+
+
+class StdoutSink(AlertSink):
+    def deliver(self, alert):
+        # Windowed interpreters have no stdout
+        if sys.stdout is None:
+            return
+        
+        sys.stdout.write(alert.to_json() + '\n')
+        sys.stdout.flush()
+
+
+class JsonLinesSink(AlertSink):
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.file = None
+    
+    def open(self):
+        self.file = open(self.file_path, 'a', encoding='utf-8')
+    
+    def release(self):
+        if self.file is not None:
+            self.file.close()
+    
+    def deliver(self, alert):
+        self.file.write(alert.to_json() + '\n')
+        self.file.flush()
+
+
+class StreamSink(AlertSink):
+    def __init__(self, address: str):
+        self.address = address
+        self.stream = None
+    
+    def connect(self):
+        # Windows named pipes are opened like files, everything else is a Unix domain socket
+        if os.name == 'nt' and self.address.startswith('\\\\.\\pipe\\'):
+            self.stream = open(self.address, 'wb', buffering=0)
+        else:
+            self.stream = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.stream.connect(self.address)
+    
+    def release(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+    
+    def write(self, data: bytes):
+        if self.stream is None:
+            self.connect()
+        
+        if isinstance(self.stream, socket.socket):
+            self.stream.sendall(data)
+        else:
+            self.stream.write(data)
+    
+    def deliver(self, alert):
+        data = (alert.to_json() + '\n').encode('utf-8')
+        
+        try:
+            self.write(data)
+        except OSError:
+            # The reader may have restarted, reconnect once before giving up on this alert
+            self.release()
+            self.write(data)
+
+
+class DiscordSink(AlertSink):
+    def __init__(self, url: str):
+        self.url = url
+    
+    def deliver(self, alert):
+        from discord_webhook import DiscordWebhook
+        
+        try:
+            DiscordWebhook(self.url, content=f'```diff\n{alert.content}\n```').execute()
+        finally:
+            # Stay under the webhook rate limit
+            QThread.msleep(1000)
+
+
+def create_sink(spec: str) -> Optional[AlertSink]:
+    kind, _, target = spec.partition(':')
+    
+    if spec == 'stdout':
+        return StdoutSink()
+    elif kind == 'jsonl' and target:
+        return JsonLinesSink(target)
+    elif kind == 'unix' and target:
+        if not hasattr(socket, 'AF_UNIX'):
+            print('Unix socket alert sinks are not supported on this platform, ignoring', spec)
+            return None
+        return StreamSink(target)
+    elif kind == 'pipe' and target:
+        if os.name != 'nt':
+            print('Named pipe alert sinks are only supported on Windows, ignoring', spec)
+            return None
+        if not target.startswith('\\\\.\\pipe\\'):
+            target = '\\\\.\\pipe\\' + target
+        return StreamSink(target)
+    elif kind == 'discord' and target:
+        return DiscordSink(target)
+    elif kind in ['http', 'https']:
+        return DiscordSink(spec)
+    
+    print('Unknown alert sink', spec)
+    return None
+
+
+class AlertDispatcher():
+    def __init__(self):
+        self.workers: dict[str, Optional[SinkWorker]] = {}
+        # Closed workers stay referenced until their worker finishes, Qt aborts on destroying a running thread
+        self.closing: list[SinkWorker] = []
+        self.specs: list[str] = []
+        self.modified = None
+        self.mutex = QMutex()
+    
+    def get_modified(self) -> tuple[float, float]:
+        return tuple(os.path.getmtime(file_path) if os.path.exists(file_path) else 0 for file_path in (SINKS_PATH, WEBHOOKS_PATH))
+    
+    def get_specs(self) -> list[str]:
+        # Only re-read the sink files after an edit, so dispatching stays off the disk
+        modified = self.get_modified()
+        if modified != self.modified:
+            self.specs = read_lines(SINKS_PATH) + [f'discord:{url}' for url in get_webhooks()]
+            self.modified = modified
+        
+        return self.specs
+    
+    def update_sinks(self, specs: list[str]):
+        self.closing = [worker for worker in self.closing if not worker.isFinished()]
+        
+        for spec in [spec for spec in self.workers if spec not in specs]:
+            worker = self.workers.pop(spec)
+            if worker is not None:
+                worker.close()
+                self.closing.append(worker)
+        
+        for spec in specs:
+            if spec in self.workers:
+                continue
+            
+            sink = create_sink(spec)
+            worker = None
+            
+            if sink is not None:
+                worker = SinkWorker(sink)
+                worker.start()
+            
+            self.workers.update({spec: worker})
+    
+    def dispatch(self, alert: Alert):
+        with QMutexLocker(self.mutex):
+            # Edits to the sink files apply without a restart, like webhooks.txt always did
+            self.update_sinks(self.get_specs())
+            workers = [worker for worker in self.workers.values() if worker is not None]
+        
+        for worker in workers:
+            worker.put(alert)
+    
+    def close(self, timeout: int = 1000):
+        with QMutexLocker(self.mutex):
+            workers = [worker for worker in self.workers.values() if worker is not None]
+            self.workers.clear()
+            self.closing.extend(workers)
+        
+        for worker in workers:
+            worker.close()
+        
+        for worker in workers:
+            worker.wait(timeout)
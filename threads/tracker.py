@@ -1,24 +1,22 @@
+import importlib
 import queue
-import os
-import traceback
-import pandas as pd
 import utils
 
-from discord_webhook import DiscordWebhook
 from PyQt5.QtCore import QThread, QRunnable, QThreadPool, QMutex, QMutexLocker
 from tradingview import TradingViewWs
+from typing import Iterable, TYPE_CHECKING
 
-from .plan import PDZonePlan, RejectionPlan, BasePlan
+from .sinks import Alert, AlertDispatcher
 
-
-def get_webhooks() -> list[str]:
-    file_path = os.path.join(os.getcwd(), 'webhooks.txt')
-    if not os.path.exists(file_path):
-        return []
-    
-    with open(file_path, encoding='utf-8') as file:
-        return file.read().splitlines()
+if TYPE_CHECKING:
+    import pandas as pd
     
+    from .plan import BasePlan
+
+
+# Same pace as the original one-session-per-second start loop, TradingView sees no burstier traffic than before
+CONNECTION_RAMP_INTERVAL = 1000
+
 
 class TrackerThread(QThread):
     def __init__(self):
@@ -27,18 +25,28 @@ class TrackerThread(QThread):
         self.mutex = QMutex()
         self.pool = QThreadPool()
         self.pool.setMaxThreadCount(999)
+        self.dispatcher = AlertDispatcher()
+        
+    def add_sessions(self, sessions: Iterable[TradingViewWs]):
+        for session in sessions:
+            self.sessions.put_nowait(session)
+            
+        if not self.isRunning():
+            self.start()
         
     def run(self):
+        # Imported only for its side effect: loads pandas/talib off the GUI thread before the first bar arrives
+        importlib.import_module('.plan', __package__)
+        
         while 1:
-            try:
-                if self.sessions.empty():
-                    continue
-
-                session = self.sessions.get_nowait()
-                
-                self.pool.start(TrackerRunnable(self, session))
-            finally:
-                QThread.msleep(1000)
+            session = self.sessions.get()
+            if session.stop:
+                continue
+            
+            self.pool.start(TrackerRunnable(self, session))
+            
+            # Spread connection starts so a bulk add does not open hundreds of sockets at once
+            QThread.msleep(CONNECTION_RAMP_INTERVAL)
                 
 class TrackerRunnable(QRunnable):
     def __init__(self, parent: TrackerThread, session: TradingViewWs):
@@ -46,9 +54,11 @@ class TrackerRunnable(QRunnable):
         self.parent = parent
         self.session = session
 
-    def handle_candle_update(self, df: pd.DataFrame):
+    def handle_candle_update(self, df: 'pd.DataFrame'):
+        from .plan import PDZonePlan, RejectionPlan
+        
         parameters = (self.session, df)
-        plans: list[BasePlan] = [PDZonePlan(*parameters), RejectionPlan(*parameters)]
+        plans: list['BasePlan'] = [PDZonePlan(*parameters), RejectionPlan(*parameters)]
         
         for plan in plans:
             if self.session.interval in ['15', '30'] and isinstance(plan, RejectionPlan):
@@ -58,14 +68,8 @@ class TrackerRunnable(QRunnable):
             if not result.result:
                 continue
             
-            zone_mapping = {
-                -1: f'- {result.message}',
-                1: f'+ {result.message}'
-            }
-            
             timeframe = utils.TIMEFRAME_MAPPING[self.session.interval]
             identify = f'{self.session.symbol_id}_{timeframe}'
-            content = f'Symbol: {self.session.symbol_id}\nTimeframe: {timeframe}\n\n{zone_mapping[result.zone]}'
             
             previous_signal_time = plan.history.get(identify)
             if previous_signal_time is not None:
@@ -76,15 +80,8 @@ class TrackerRunnable(QRunnable):
                     if previous_signal_time is not None and previous_signal_time == result.base_candle['time']:
                         continue
                     
-            webhooks = get_webhooks()
-            
-            for url in webhooks:
-                try:
-                    DiscordWebhook(url, content=f'```diff\n{content}\n```').execute()
-                except Exception:
-                    traceback.print_exc()
-                
-                QThread.msleep(1000)
+            alert = Alert(self.session.symbol_id, timeframe, type(plan).__name__, result.zone, result.message, str(result.base_candle['time']))
+            self.parent.dispatcher.dispatch(alert)
                 
             with QMutexLocker(self.parent.mutex):
                 if isinstance(plan, PDZonePlan):
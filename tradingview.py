@@ -3,26 +3,43 @@ import json
 import random
 import string
 import re
-import pandas as pd
+import sys
 
 from collections import OrderedDict
-from typing import List, Union, Callable, Self
-from websocket import WebSocketApp
+from typing import List, Union, Callable, Self, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+    
+    from candles import CompactCandles
+    from websocket import WebSocketApp
+
+# A parsed bar: the list json.loads builds for "v" and its six floats, the time float doubles as the key
+CANDLE_SIZE = sys.getsizeof(json.loads('[0.0,0.0,0.0,0.0,0.0,0.0]')) + 6 * sys.getsizeof(0.0)
 
 
 class TradingViewWs():
-    def __init__(self, symbol_id: str, interval: Union[int, str], timezone: str = 'Asia/Ho_Chi_Minh'):
+    def __init__(self, symbol_id: str, interval: Union[int, str], timezone: str = 'Asia/Ho_Chi_Minh', compact: bool = False):
         self.symbol_id = symbol_id
         self.interval = interval
         self.timezone = timezone
-        self.candles: OrderedDict[float, List[float]] = OrderedDict()
+        self.compact = compact
+        self.candles: Union[OrderedDict[float, List[float]], 'CompactCandles'] = OrderedDict()
+        
+        if compact:
+            from candles import CompactCandles
+            
+            self.candles = CompactCandles()
+            
         self.price_scale = 0
         self.ws = None
         self.stop = False
 
     def close(self):
         self.stop = True
-        self.ws.close()
+        
+        if self.ws is not None:
+            self.ws.close()
         
     def generate_session(self, type: str) -> str:
         string_length = 12
@@ -39,10 +56,68 @@ class TradingViewWs():
     def create_message(self, func: str, param_list: list) -> str:
         return self.prepend_header(self.construct_message(func, param_list))
     
-    def send_message(self, ws: WebSocketApp, func: str, param_list: list):
+    def send_message(self, ws: 'WebSocketApp', func: str, param_list: list):
         ws.send(self.create_message(func, param_list))
         
-    def realtime_bar_chart(self, total_candle: int, callback: Callable[[Self, pd.DataFrame], None]):
+    def update_candles(self, message: str, total_candle: int) -> bool:
+        if not self.price_scale:
+            price_scale = re.findall(r'"pricescale":(\d+)', message)
+            if not price_scale:
+                return False
+            self.price_scale = int(price_scale[0])
+                
+        data = re.findall(r'"s":(\[.*?}\])', message)
+        if not data:
+            return False
+        
+        data = data[-1]
+        items = json.loads(data)
+        
+        if self.compact:
+            try:
+                self.candles.update(items, total_candle, self.price_scale)
+                return True
+            except OverflowError:
+                # Prices past the int32 tick range keep working in the default storage
+                self.candles = OrderedDict((candle[0], candle) for candle in self.candles.to_list())
+                self.compact = False
+                
+        if len(self.candles) >= total_candle:
+            for _ in range(len(self.candles) - total_candle):
+                self.candles.popitem(last=False)
+                
+        for item in items:
+            self.candles.update({item['v'][0]: item['v']})
+            
+        return True
+    
+    def get_dataframe(self) -> 'pd.DataFrame':
+        import pandas as pd
+        
+        if self.compact:
+            df = self.candles.to_dataframe()
+        else:
+            df = pd.DataFrame(self.candles.values(), columns=['time', 'open', 'high', 'low', 'close', 'volume'])
+            
+        df['time'] = pd.to_datetime(df['time'], unit='s', utc=True).dt.tz_convert(self.timezone)
+        df['time'] = df['time'].dt.tz_localize(None)
+        
+        return df
+        
+    def memory_usage(self) -> int:
+        if self.compact:
+            return self.candles.nbytes
+        
+        # Walking every boxed float freezes the window at a few hundred series, every bar costs the same anyway
+        return sys.getsizeof(self.candles) + len(self.candles) * CANDLE_SIZE
+        
+    def realtime_bar_chart(self, total_candle: int, callback: Callable[[Self, 'pd.DataFrame'], None]):
+        if self.stop:
+            return
+        
+        # Imported here so the window comes up before the network stack is loaded
+        from websocket import WebSocketApp
+        
         def on_open(ws: WebSocketApp):
             session = self.generate_session("qs_")
             chart_session = self.generate_session("cs_")
@@ -69,31 +144,8 @@ class TradingViewWs():
             if message[7:].startswith('~h~'): # ping
                 ws.send(self.prepend_header(message[7:]))
                 
-            if not self.price_scale:
-                price_scale = re.findall(r'"pricescale":(\d+)', message)
-                if not price_scale:
-                    return
-                self.price_scale = int(price_scale[0])
-                    
-            data = re.findall(r'"s":(\[.*?}\])', message)
-            if not data:
-                return
-            
-            data = data[-1]
-            items = json.loads(data)
-            
-            if len(self.candles) >= total_candle:
-                for _ in range(len(self.candles) - total_candle):
-                    self.candles.popitem(last=False)
-                    
-            for item in items:
-                self.candles.update({item['v'][0]: item['v']})
-                
-            df = pd.DataFrame(self.candles.values(), columns=['time', 'open', 'high', 'low', 'close', 'volume'])
-            df['time'] = pd.to_datetime(df['time'], unit='s', utc=True).dt.tz_convert(self.timezone)
-            df['time'] = df['time'].dt.tz_localize(None)
-            
-            callback(df)
+            if self.update_candles(message, total_candle):
+                callback(self.get_dataframe())
 
         def on_error(ws: WebSocketApp, error: Exception):
             print('Error', error)
@@ -6,6 +6,9 @@ from dataclasses import dataclass
 
 
 ASSETS_PATH = os.path.join(os.getcwd(), 'assets.json')
+WATCHLIST_PATH = os.path.join(os.getcwd(), 'watchlist.json')
+COMPACT_CANDLES = os.environ.get('PD_ALERTS_COMPACT', '') == '1'
+TIMEFRAMES = ['15m', '30m', '1h', '4h']
 TIMEFRAME_MAPPING = {
     '15m': '15',
     '30m': '30',
@@ -41,4 +44,47 @@ class Asset:
                     assets.update({k: Asset(k, **v)})
                     
         return assets
-    
\ No newline at end of file
+
+
+class Watchlist:
+    @staticmethod
+    def read(file_path: str = WATCHLIST_PATH) -> dict[str, list[str]]:
+        watchlist = {}
+        
+        if os.path.exists(file_path):
+            with open(file_path, encoding='utf-8') as file:
+                data: dict = json.load(file)
+                
+                for symbol, timeframes in data.items():
+                    timeframes = [timeframe for timeframe in timeframes if timeframe in TIMEFRAMES]
+                    if timeframes:
+                        watchlist.update({symbol: timeframes})
+                        
+        return watchlist
+    
+    @staticmethod
+    def write(watchlist: dict[str, list[str]], file_path: str = WATCHLIST_PATH):
+        # Write next to the original and swap it in, so a crash mid-write never leaves a truncated watchlist
+        temp_path = f'{file_path}.tmp'
+        
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(watchlist, file, indent=4)
+            
+        os.replace(temp_path, file_path)
+
+
+def get_rss() -> int:
+    import psutil
+    
+    return psutil.Process().memory_info().rss
+
+
+def format_memory_report(rss: int, usages: dict[str, int], limit: Optional[int] = None) -> str:
+    total = sum(usages.values())
+    lines = [f'RSS {rss / 1024 ** 2:.1f} MiB, candles {total / 1024 ** 2:.2f} MiB in {len(usages)} series, '
+             f'other {(rss - total) / 1024 ** 2:.1f} MiB']
+    
+    for identify, usage in sorted(usages.items(), key=lambda x: x[1], reverse=True)[:limit]:
+        lines.append(f'{identify}: {usage / 1024:.1f} KiB ({usage / rss:.2%} of RSS)')
+        
+    return '\n'.join(lines)
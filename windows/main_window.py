@@ -1,10 +1,12 @@
 import json
 import os
+import traceback
 import utils
 
 from tradingview import TradingViewWs
 from threads import TrackerThread
-from PyQt5.QtCore import (QCoreApplication, QMetaObject, QSize, Qt, QFileSystemWatcher, QThread)
+from typing import Optional
+from PyQt5.QtCore import (QCoreApplication, QMetaObject, QSize, Qt, QFileSystemWatcher, QTimer)
 from PyQt5.QtGui import QCursor, QStandardItemModel, QStandardItem, QCloseEvent
 from PyQt5.QtWidgets import *
 
@@ -27,19 +29,35 @@ class MainWindow(QMainWindow):
         self.ui.lineEdit.setCompleter(QCompleter(self.symbols_model, self))
         
         self.ui.pushButton.clicked.connect(self.pushButton_clicked)
-        
-        self.update_watched_files()
+        self.ui.addAllButton.clicked.connect(self.addAllButton_clicked)
+        self.ui.importButton.clicked.connect(self.importButton_clicked)
+        self.ui.removeAllButton.clicked.connect(self.removeAllButton_clicked)
         
         self.sessions: dict[str, TradingViewWs] = {}
+        self.watchlist: dict[str, list[str]] = {}
         self.tracker = TrackerThread()
-        self.tracker.start()
         
-    def is_valid_exchange_symbol(self, symbol: str) -> bool:
+        # Load assets and restore the watchlist once the event loop is running so the window shows first,
+        # the tracker itself starts with the first batch of sessions
+        QTimer.singleShot(0, self.update_watched_files)
+        QTimer.singleShot(0, self.restore_watchlist)
+        
+        # Default mode reports after each watchlist change, compact mode is where memory is watched
+        self.memory_timer = QTimer(self)
+        self.memory_timer.timeout.connect(self.update_memory_usage)
+        
+        if utils.COMPACT_CANDLES:
+            self.memory_timer.start(5000)
+        
+    def is_valid_exchange_symbol(self, symbol: str, assets: Optional[dict[str, utils.Asset]] = None) -> bool:
+        if symbol.count(':') != 1:
+            return False
+        
         exchange, symbol = symbol.split(":")
         if not exchange or not symbol:
             return False
         
-        asset = utils.Asset.get(symbol)
+        asset = utils.Asset.get(symbol) if assets is None else assets.get(symbol)
         if not asset or (asset and not exchange in asset.exchanges):
             return False
         
@@ -61,67 +79,154 @@ class MainWindow(QMainWindow):
             for exchange in v.exchanges:
                 self.symbols_model.appendRow(QStandardItem(f'{k}:{exchange}'))
                 
-    def remove_button_clicked(self):
-        row = self.ui.tableWidget.currentRow()
-
-        symbol = self.ui.tableWidget.item(row, 0).text()
+    def update_memory_usage(self):
+        usages = {identify: session.memory_usage() for identify, session in list(self.sessions.items())}
+        report = utils.format_memory_report(utils.get_rss(), usages, limit=30)
         
-        timeframes = self.ui.tableWidget.item(row, 1).text()
-        timeframes = timeframes.split(',')
+        self.statusBar().showMessage(report.splitlines()[0])
+        self.statusBar().setToolTip(report)
         
-        for timeframe in timeframes:
-            timeframe = timeframe.strip()
-            identify = f'{symbol}_{timeframe}'
-
-            session = self.sessions[identify]
-            session.close()
+    def restore_watchlist(self):
+        try:
+            watchlist = utils.Watchlist.read()
+        except (OSError, ValueError, AttributeError, TypeError):
+            traceback.print_exc()
             
-            self.sessions.pop(identify)
+            # Keep the unreadable file, the next save would otherwise replace it with an empty watchlist
+            try:
+                os.replace(utils.WATCHLIST_PATH, f'{utils.WATCHLIST_PATH}.bak')
+            except OSError:
+                traceback.print_exc()
+            return
+        
+        self.add_symbols(watchlist)
+            
+    def save_watchlist(self):
+        try:
+            utils.Watchlist.write(self.watchlist)
+        except OSError:
+            traceback.print_exc()
             
-        self.ui.tableWidget.removeRow(row)
+    def add_symbols(self, watchlist: dict[str, list[str]]):
+        assets = utils.Asset.read()
+        sessions: list[TradingViewWs] = []
+        
+        self.ui.tableWidget.setUpdatesEnabled(False)
+        
+        for symbol, timeframes in watchlist.items():
+            if symbol in self.watchlist or not self.is_valid_exchange_symbol(symbol, assets):
+                continue
+            
+            timeframes = [timeframe for timeframe in utils.TIMEFRAMES if timeframe in timeframes]
+            if not timeframes:
+                continue
+            
+            button = QPushButton('Remove')
+            button.setStyleSheet('border-radius: none; margin: 1px;')
+            button.setCursor(Qt.CursorShape.PointingHandCursor)
+            button.clicked.connect(self.remove_button_clicked)
+            
+            row = self.ui.tableWidget.rowCount()
+            self.ui.tableWidget.insertRow(row)
+            self.ui.tableWidget.setItem(row, 0, QTableWidgetItem(symbol))
+            self.ui.tableWidget.setItem(row, 1, QTableWidgetItem(', '.join(timeframes)))
+            self.ui.tableWidget.setCellWidget(row, 2, button)
+            
+            for timeframe in timeframes:
+                session = TradingViewWs(symbol, utils.TIMEFRAME_MAPPING[timeframe], compact=utils.COMPACT_CANDLES)
+                
+                self.sessions.update({f'{symbol}_{timeframe}': session})
+                sessions.append(session)
+                
+            self.watchlist.update({symbol: timeframes})
+            
+        self.ui.tableWidget.setUpdatesEnabled(True)
+        
+        if not sessions:
+            return
+        
+        self.tracker.add_sessions(sessions)
+        self.save_watchlist()
+        self.update_memory_usage()
+        
+    def remove_symbols(self, symbols: list[str]):
+        for symbol in symbols:
+            timeframes = self.watchlist.pop(symbol, [])
+            
+            for timeframe in timeframes:
+                session = self.sessions.pop(f'{symbol}_{timeframe}')
+                session.close()
+                
+            items: list[QTableWidgetItem] = self.ui.tableWidget.findItems(symbol, Qt.MatchExactly)
+            for item in items:
+                if item.column() == 0:
+                    self.ui.tableWidget.removeRow(item.row())
+                    
+        self.save_watchlist()
+        self.update_memory_usage()
+        
+    def remove_button_clicked(self):
+        button: QPushButton = self.sender()
+        row = self.ui.tableWidget.indexAt(button.pos()).row()
+        if row < 0:
+            return
+        
+        symbol = self.ui.tableWidget.item(row, 0).text()
+        
+        self.remove_symbols([symbol])
         
     def closeEvent(self, _: QCloseEvent):
         for _, session in self.sessions.items():
             session.close()
             
+        self.tracker.dispatcher.close()
+            
     def pushButton_clicked(self):
         symbol = self.get_exchange_symbol()
         if not self.is_valid_exchange_symbol(symbol):
             return
         
-        items: list[QTableWidgetItem] = self.ui.tableWidget.findItems(symbol, Qt.MatchExactly)
-        if items:
+        timeframes = self.ui.comboBox.currentData()
+        if not timeframes:
             return
         
+        self.add_symbols({symbol: timeframes})
+        
+    def addAllButton_clicked(self):
         timeframes = self.ui.comboBox.currentData()
         if not timeframes:
             return
         
-        button = QPushButton('Remove')
-        button.setStyleSheet('border-radius: none; margin: 1px;')
-        button.setCursor(Qt.CursorShape.PointingHandCursor)
-        button.clicked.connect(self.remove_button_clicked)
+        watchlist = {}
         
-        row = self.ui.tableWidget.rowCount()
-        self.ui.tableWidget.insertRow(row)
-        self.ui.tableWidget.setItem(row, 0, QTableWidgetItem(symbol))
-        self.ui.tableWidget.setItem(row, 1, QTableWidgetItem(self.ui.comboBox.currentText()))
-        self.ui.tableWidget.setCellWidget(row, 2, button)
+        for k, v in utils.Asset.read().items():
+            for exchange in v.exchanges:
+                watchlist.update({f'{exchange}:{k}': timeframes})
+                
+        self.add_symbols(watchlist)
+        
+    def importButton_clicked(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, 'Import watchlist', os.getcwd(), 'Watchlist (*.json)')
+        if not file_path:
+            return
+        
+        try:
+            watchlist = utils.Watchlist.read(file_path)
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            QMessageBox.warning(self, 'Import watchlist', f'Could not read {file_path}\n\n{e}')
+            return
+        
+        self.add_symbols(watchlist)
+        
+    def removeAllButton_clicked(self):
+        self.remove_symbols(list(self.watchlist))
         
-        for timeframe in timeframes:
-            session = TradingViewWs(symbol, utils.TIMEFRAME_MAPPING[timeframe])
-            
-            self.sessions.update({f'{symbol}_{timeframe}': session})
-            self.tracker.sessions.put_nowait(session)
-            
-            QThread.msleep(30)
-            
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
         if MainWindow.objectName():
             MainWindow.setObjectName(u"MainWindow")
-        MainWindow.resize(601, 459)
-        MainWindow.setMinimumSize(QSize(601, 459))
+        MainWindow.resize(801, 459)
+        MainWindow.setMinimumSize(QSize(801, 459))
         MainWindow.setStyleSheet(u"font: 10pt \"Segoe UI\";")
         self.centralwidget = QWidget(MainWindow)
         self.centralwidget.setObjectName(u"centralwidget")
@@ -169,6 +274,30 @@ class Ui_MainWindow(object):
 
         self.horizontalLayout_2.addWidget(self.pushButton)
 
+        self.addAllButton = QPushButton(self.frame_2)
+        self.addAllButton.setObjectName(u"addAllButton")
+        self.addAllButton.setMinimumSize(QSize(100, 31))
+        self.addAllButton.setMaximumSize(QSize(100, 31))
+        self.addAllButton.setCursor(QCursor(Qt.PointingHandCursor))
+
+        self.horizontalLayout_2.addWidget(self.addAllButton)
+
+        self.importButton = QPushButton(self.frame_2)
+        self.importButton.setObjectName(u"importButton")
+        self.importButton.setMinimumSize(QSize(100, 31))
+        self.importButton.setMaximumSize(QSize(100, 31))
+        self.importButton.setCursor(QCursor(Qt.PointingHandCursor))
+
+        self.horizontalLayout_2.addWidget(self.importButton)
+
+        self.removeAllButton = QPushButton(self.frame_2)
+        self.removeAllButton.setObjectName(u"removeAllButton")
+        self.removeAllButton.setMinimumSize(QSize(100, 31))
+        self.removeAllButton.setMaximumSize(QSize(100, 31))
+        self.removeAllButton.setCursor(QCursor(Qt.PointingHandCursor))
+
+        self.horizontalLayout_2.addWidget(self.removeAllButton)
+
 
         self.verticalLayout.addWidget(self.frame_2)
 
@@ -213,10 +342,13 @@ class Ui_MainWindow(object):
         MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"PD ALERTS", None))
         self.lineEdit.setPlaceholderText(QCoreApplication.translate("MainWindow", u"Symbol", None))
         
-        self.comboBox.addItems(['15m', '30m', '1h', '4h'])
+        self.comboBox.addItems(utils.TIMEFRAMES)
         self.comboBox.setCurrentText('15m')
         
         self.pushButton.setText(QCoreApplication.translate("MainWindow", u"Add", None))
+        self.addAllButton.setText(QCoreApplication.translate("MainWindow", u"Add All", None))
+        self.importButton.setText(QCoreApplication.translate("MainWindow", u"Import", None))
+        self.removeAllButton.setText(QCoreApplication.translate("MainWindow", u"Remove All", None))
         ___qtablewidgetitem = self.tableWidget.horizontalHeaderItem(0)
         ___qtablewidgetitem.setText(QCoreApplication.translate("MainWindow", u"Symbol", None));
         ___qtablewidgetitem1 = self.tableWidget.horizontalHeaderItem(1)